@@ -1,16 +1,18 @@
 import keyboard
+import queue
 import threading
-import time
-from wavemaker import SoundPlayer, AVAILABLE_SOUNDS
+from wavemaker import SoundPlayer, SOUND_IDS, SOUND_NAMES
 from notes import is_valid_note
+from keypoll import create_key_poller
 
 class PianoKeyboard:
     """Interactive piano keyboard using computer keys"""
     
     def __init__(self):
         self.current_octave = 4
-        self.current_sound = "piano"
+        self.current_sound_id = SOUND_IDS["piano"]
         self.running = True
+        self._stop = threading.Event()
         
         # Keyboard layout mapping
         self.key_mapping = {
@@ -24,17 +26,17 @@ class PianoKeyboard:
             'h': 'G#', 'j': 'A#', 'l': 'C#', ';': 'D#',  # Next octave
         }
         
-        # Sound selection (number keys)
+        # Sound selection (number keys), mapped to preset ids
         self.sound_keys = {
-            '1': "piano",
-            '2': "organ", 
-            '3': "guitar",
-            '4': "synth",
-            '5': "bell",
-            '6': "retro",
-            '7': "pad",
-            '8': "bass",
-            '9': "sine",
+            '1': SOUND_IDS["piano"],
+            '2': SOUND_IDS["organ"], 
+            '3': SOUND_IDS["guitar"],
+            '4': SOUND_IDS["synth"],
+            '5': SOUND_IDS["bell"],
+            '6': SOUND_IDS["retro"],
+            '7': SOUND_IDS["pad"],
+            '8': SOUND_IDS["bass"],
+            '9': SOUND_IDS["sine"],
         }
         
         # Chord definitions
@@ -46,6 +48,24 @@ class PianoKeyboard:
         }
         
         self.current_chord = 'major'
+        
+        # Display name and notes of the current selection, refreshed only when it changes
+        self._current_sound_name = SOUND_NAMES[self.current_sound_id]
+        self._current_chord_notes = self.chords[self.current_chord]
+        
+        # Single playback worker so keypresses never wait on thread creation
+        self._queue = queue.SimpleQueue()
+        self._worker = threading.Thread(target=self._play_worker, daemon=True)
+        self._worker.start()
+    
+    def _play_worker(self):
+        """Play queued notes and chords until the stop sentinel arrives"""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            play, args = job
+            play(*args)
     
     def get_octave_for_note(self, note: str) -> int:
         """Calculate correct octave for note based on keyboard layout"""
@@ -69,33 +89,23 @@ class PianoKeyboard:
                 print(f"⚠️  Note {note}{octave} not available")
                 return
         
-        # Play the note in a separate thread to avoid blocking
-        threading.Thread(
-            target=SoundPlayer.play_note, 
-            args=(note, octave, self.current_sound, 1.0),
-            daemon=True
-        ).start()
+        # Hand the note to the playback worker to avoid blocking
+        self._queue.put((SoundPlayer.play_note, (note, octave, self.current_sound_id, 1.0)))
         
         # Show what's playing
-        sound_name = AVAILABLE_SOUNDS[self.current_sound][0]
-        print(f"♪ {note}{octave} - {sound_name}")
+        print(f"♪ {note}{octave} - {self._current_sound_name}")
         self._last_played_note = note
     
     def play_chord(self):
         """Play current chord type"""
-        chord_notes = self.chords[self.current_chord]
+        chord_notes = self._current_chord_notes
         octave = self.current_octave
         
-        # Play chord in separate thread
-        threading.Thread(
-            target=SoundPlayer.play_chord,
-            args=(chord_notes, octave, self.current_sound, 2.0),
-            daemon=True
-        ).start()
+        # Play chord on the playback worker
+        self._queue.put((SoundPlayer.play_chord, (chord_notes, octave, self.current_sound_id, 2.0)))
         
-        sound_name = AVAILABLE_SOUNDS[self.current_sound][0]
         chord_display = " + ".join([f"{note}{octave}" for note in chord_notes])
-        print(f"🎵 {self.current_chord.title()} Chord: {chord_display} - {sound_name}")
+        print(f"🎵 {self.current_chord.title()} Chord: {chord_display} - {self._current_sound_name}")
     
     def change_octave(self, direction: int):
         """Change current octave"""
@@ -107,7 +117,8 @@ class PianoKeyboard:
     def change_sound(self, sound_key: str):
         """Change current sound preset"""
         if sound_key in self.sound_keys:
-            self.current_sound = self.sound_keys[sound_key]
+            self.current_sound_id = self.sound_keys[sound_key]
+            self._current_sound_name = SOUND_NAMES[self.current_sound_id]
             self.show_status()
     
     def cycle_chord(self):
@@ -116,12 +127,12 @@ class PianoKeyboard:
         current_index = chord_list.index(self.current_chord)
         next_index = (current_index + 1) % len(chord_list)
         self.current_chord = chord_list[next_index]
+        self._current_chord_notes = self.chords[self.current_chord]
         print(f"🎵 Chord type: {self.current_chord.title()}")
     
     def show_status(self):
         """Display current settings"""
-        sound_name = AVAILABLE_SOUNDS[self.current_sound][0]
-        print(f"🎵 {sound_name} | Octave: {self.current_octave} | Chord: {self.current_chord.title()}")
+        print(f"🎵 {self._current_sound_name} | Octave: {self.current_octave} | Chord: {self.current_chord.title()}")
     
     def show_help(self):
         """Display help information"""
@@ -139,7 +150,7 @@ class PianoKeyboard:
         
         print("\n🎵 SOUNDS (Number Keys 1-9):")
         for key, sound_id in self.sound_keys.items():
-            sound_name = AVAILABLE_SOUNDS[sound_id][0]
+            sound_name = SOUND_NAMES[sound_id]
             print(f"   {key}: {sound_name}")
         
         print("\n🎛️  CONTROLS:")
@@ -151,8 +162,7 @@ class PianoKeyboard:
         print("   ESC/Q: Quit")
         
         print("\n🎵 CURRENT SETTINGS:")
-        sound_name = AVAILABLE_SOUNDS[self.current_sound][0]
-        print(f"   Sound: {sound_name}")
+        print(f"   Sound: {self._current_sound_name}")
         print(f"   Octave: {self.current_octave}")
         print(f"   Chord: {self.current_chord.title()}")
         
@@ -161,13 +171,16 @@ class PianoKeyboard:
     def random_sound(self):
         """Switch to random sound"""
         import random
-        self.current_sound = random.choice(list(self.sound_keys.values()))
+        self.current_sound_id = random.choice(list(self.sound_keys.values()))
+        self._current_sound_name = SOUND_NAMES[self.current_sound_id]
         self.show_status()
     
     def on_key_press(self, event):
         """Handle keyboard events"""
-        key = event.name.lower()
-        
+        self.handle_key(event.name.lower())
+    
+    def handle_key(self, key: str):
+        """Handle a key press by name"""
         # Sound selection (number keys)
         if key in self.sound_keys:
             self.change_sound(key)
@@ -198,7 +211,9 @@ class PianoKeyboard:
     def quit(self):
         """Quit the piano"""
         print("\n🎵 Thanks for playing! 🎵")
+        self._stop.set()
         self.running = False
+        self._queue.put(None)
     
     def start(self):
         """Start the piano keyboard"""
@@ -207,7 +222,8 @@ class PianoKeyboard:
         # Test audio
         try:
             print("Testing audio system...")
-            SoundPlayer.play_note('A', 4, 'sine', 0.2)
+            SoundPlayer.open_stream()
+            SoundPlayer.play_note('A', 4, SOUND_IDS["sine"], 0.2)
             SoundPlayer.wait()
             print("✓ Audio system ready!")
         except Exception as e:
@@ -217,18 +233,27 @@ class PianoKeyboard:
         # Show initial interface
         self.show_help()
         
-        # Setup keyboard listener
-        keyboard.on_press(self.on_key_press)
+        # Setup keyboard listener, polling the OS directly where supported
+        poller = create_key_poller(self.handle_key)
+        if poller is not None:
+            poller.start()
+        else:
+            keyboard.on_press(self.on_key_press)
         
         try:
             print("\n🎵 Piano is ready! Press 'H' for help anytime. 🎵\n")
-            while self.running:
-                time.sleep(0.1)
+            # Sleep until quit() instead of waking up to poll
+            self._stop.wait()
         except KeyboardInterrupt:
             print("\n⚠️  Interrupted by user")
+            self._queue.put(None)
         finally:
             print("🎵 Shutting down...")
+            if poller is not None:
+                poller.stop()
             keyboard.unhook_all()
+            self._worker.join(timeout=1.0)
+            SoundPlayer.close_stream()
 
 
 def main():
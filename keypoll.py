@@ -0,0 +1,133 @@
+# Native Key Polling
+# Reads key state straight from the OS on a dedicated thread, bypassing the
+# keyboard library's event queue for lower keypress-to-audio latency
+
+import select
+import sys
+import threading
+import time
+
+# Keys are reported by the same names the keyboard library uses
+LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+DIGITS = '123456789'
+
+# Windows virtual-key codes
+WIN32_KEYS = {
+    **{ord(c.upper()): c for c in LETTERS},
+    **{ord(d): d for d in DIGITS},
+    0xBC: ',', 0xBE: '.', 0xBF: '/', 0xBA: ';',
+    0x26: 'up', 0x28: 'down', 0x20: 'space', 0x09: 'tab', 0x1B: 'esc',
+}
+
+# Linux evdev key code names
+EVDEV_KEYS = {
+    **{f'KEY_{c.upper()}': c for c in LETTERS + DIGITS},
+    'KEY_COMMA': ',', 'KEY_DOT': '.', 'KEY_SLASH': '/', 'KEY_SEMICOLON': ';',
+    'KEY_UP': 'up', 'KEY_DOWN': 'down', 'KEY_SPACE': 'space', 'KEY_TAB': 'tab', 'KEY_ESC': 'esc',
+}
+
+
+class Win32KeyPoller:
+    """Poll GetAsyncKeyState at ~1 kHz and report new key presses"""
+    
+    def __init__(self, on_press):
+        import ctypes
+        self._get_key_state = ctypes.windll.user32.GetAsyncKeyState
+        self._on_press = on_press
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+    
+    def start(self):
+        """Start polling in the background"""
+        self._thread.start()
+    
+    def stop(self):
+        """Stop polling"""
+        self._stop.set()
+    
+    def _run(self):
+        """Report every key that went down since the previous poll"""
+        held = set()
+        while not self._stop.is_set():
+            for vk, name in WIN32_KEYS.items():
+                if self._get_key_state(vk) & 0x8000:
+                    if vk not in held:
+                        held.add(vk)
+                        self._on_press(name)
+                else:
+                    held.discard(vk)
+            time.sleep(0.001)
+
+
+class EvdevKeyPoller:
+    """Read key presses straight from Linux input devices"""
+    
+    def __init__(self, on_press, devices):
+        from evdev import ecodes
+        self._ev_key = ecodes.EV_KEY
+        self._names = {ecodes.ecodes[code]: name for code, name in EVDEV_KEYS.items()}
+        self._on_press = on_press
+        self._devices = {device.fd: device for device in devices}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+    
+    def start(self):
+        """Start reading in the background"""
+        self._thread.start()
+    
+    def stop(self):
+        """Stop reading"""
+        self._stop.set()
+    
+    def _run(self):
+        """Dispatch key-down events (not auto-repeats) as they arrive"""
+        while self._devices and not self._stop.is_set():
+            # Short timeout only so stop() is noticed; events wake select immediately
+            ready, _, _ = select.select(list(self._devices), [], [], 0.1)
+            for fd in ready:
+                device = self._devices[fd]
+                try:
+                    events = list(device.read())
+                except BlockingIOError:
+                    continue
+                except OSError:
+                    # Device unplugged
+                    del self._devices[fd]
+                    continue
+                for event in events:
+                    if event.type == self._ev_key and event.value == 1:
+                        name = self._names.get(event.code)
+                        if name is not None:
+                            self._on_press(name)
+        
+        for device in self._devices.values():
+            device.close()
+
+
+def create_key_poller(on_press):
+    """Return a native key poller for this platform, or None if there is none"""
+    if sys.platform == 'win32':
+        return Win32KeyPoller(on_press)
+    
+    if sys.platform.startswith('linux'):
+        try:
+            import evdev
+        except ImportError:
+            return None
+        
+        keyboards = []
+        for path in evdev.list_devices():
+            try:
+                device = evdev.InputDevice(path)
+            except OSError:
+                continue
+            keys = device.capabilities().get(evdev.ecodes.EV_KEY, [])
+            if evdev.ecodes.KEY_Z in keys and evdev.ecodes.KEY_SPACE in keys:
+                keyboards.append(device)
+            else:
+                device.close()
+        
+        if keyboards:
+            return EvdevKeyPoller(on_press, keyboards)
+    
+    return None
@@ -72,6 +72,12 @@ NOTE_FREQUENCIES = {
     }
 }
 
+# Semitones above C within an octave, for MIDI-style note numbering
+NOTE_SEMITONES = {
+    'C': 0, 'C#': 1, 'Db': 1, 'D': 2, 'D#': 3, 'Eb': 3, 'E': 4, 'F': 5,
+    'F#': 6, 'Gb': 6, 'G': 7, 'G#': 8, 'Ab': 8, 'A': 9, 'A#': 10, 'Bb': 10, 'B': 11
+}
+
 def get_frequency(note: str, octave: int) -> float:
     """Get frequency for a specific note and octave"""
     if note in NOTE_FREQUENCIES and octave in NOTE_FREQUENCIES[note]:
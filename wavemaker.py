@@ -1,26 +1,133 @@
+import collections
+import concurrent.futures
+import functools
+import math
+import threading
 import numpy as np
 import sounddevice as sd
-from notes import get_frequency
+from numba import njit
+from notes import NOTE_SEMITONES
 
 SAMPLE_RATE = 44100
 
+# Equal-tempered frequency of every MIDI note number (A4 = 69 = 440 Hz)
+_FREQ_TABLE = np.array([440.0 * 2 ** ((m - 69) / 12) for m in range(128)], dtype=np.float32)
+
+# Compiled sample loops: no temporaries, no Python overhead per sample, and
+# the GIL is released so chord voices can render on parallel threads
+_kernel = njit(fastmath=True, cache=True, boundscheck=False, nogil=True)
+
+
+@_kernel
+def _oscillator_bank(step, ratios):
+    """Rotation state (sin, cos, sin of step, cos of step) per partial, starting at phase 0"""
+    bank = np.empty((4, ratios.shape[0]))
+    for k in range(ratios.shape[0]):
+        delta = 2.0 * math.pi * step * ratios[k]
+        bank[0, k] = 0.0
+        bank[1, k] = 1.0
+        bank[2, k] = math.sin(delta)
+        bank[3, k] = math.cos(delta)
+    return bank
+
+
+@_kernel
+def _oscillator_sample(bank, amps):
+    """Weighted sum of the current partials, then advance each one sample"""
+    # sin(x + d) = sin x cos d + cos x sin d: a few multiply-adds instead of sin();
+    # in float64 the drift over even multi-second notes stays far below audibility
+    acc = 0.0
+    for k in range(amps.shape[0]):
+        s = bank[0, k]
+        c = bank[1, k]
+        acc += amps[k] * s
+        bank[0, k] = s * bank[3, k] + c * bank[2, k]
+        bank[1, k] = c * bank[3, k] - s * bank[2, k]
+    return acc
+
+
+@_kernel
+def _harmonic_kernel(out, freq, ratios, amps, sample_rate):
+    """Fill out with the sum of partials of freq in a single pass"""
+    bank = _oscillator_bank(freq / sample_rate, ratios)
+    for n in range(out.shape[0]):
+        out[n] = _oscillator_sample(bank, amps)
+
+
+@_kernel
+def _adsr_gain(n, total, attack, decay, sustain, release):
+    """ADSR envelope value at sample n, matching AudioEffects.apply_envelope"""
+    if release > 0 and n >= total - release:
+        if release == 1:
+            return sustain
+        return sustain * (1.0 - (n - (total - release)) / (release - 1))
+    if n < attack:
+        if attack == 1:
+            return 0.0
+        return n / (attack - 1)
+    if n < attack + decay:
+        if decay == 1:
+            return 1.0
+        return 1.0 + (sustain - 1.0) * (n - attack) / (decay - 1)
+    return sustain
+
+
+@_kernel
+def _reverb_envelope_pass(out, tap_delays, tap_gains, attack, decay, sustain, release):
+    """Convolve out in place with a sparse echo response, then apply the envelope"""
+    total = out.shape[0]
+    # Walk backwards so every tap still reads the dry sample
+    for n in range(total - 1, -1, -1):
+        acc = out[n]
+        for i in range(tap_delays.shape[0]):
+            tap = n - tap_delays[i]
+            if tap >= 0:
+                acc += tap_gains[i] * out[tap]
+        out[n] = acc * _adsr_gain(n, total, attack, decay, sustain, release)
+
+
+@_kernel
+def _voice_kernel(out, freq, ratios, amps, scale, sample_rate, mod_rate, mod_depth, decay_rate,
+                  attack, decay, sustain, release, tap_delays, tap_gains):
+    """Render partials, modulation, decay, reverb and envelope with no intermediate buffers"""
+    total = out.shape[0]
+    bank = _oscillator_bank(freq / sample_rate, ratios)
+    unit = np.ones(1)
+    mod_bank = _oscillator_bank(mod_rate / sample_rate, unit)
+    # Exponential decay as a running product instead of exp() per sample
+    fade = 1.0
+    fade_step = math.exp(-decay_rate / sample_rate)
+    # Without reverb the envelope is applied in the same pass
+    dry = tap_delays.shape[0] == 0
+    for n in range(total):
+        acc = scale * _oscillator_sample(bank, amps)
+        acc *= 1.0 + mod_depth * _oscillator_sample(mod_bank, unit)
+        acc *= fade
+        fade *= fade_step
+        if dry:
+            acc *= _adsr_gain(n, total, attack, decay, sustain, release)
+        out[n] = acc
+    if not dry:
+        _reverb_envelope_pass(out, tap_delays, tap_gains,
+                              attack, decay, sustain, release)
+
+
 class WaveGenerator:
     """Generate different types of waveforms"""
     
     def __init__(self, note: str, octave: int, amplitude: float = 0.3):
         self.note = note
         self.octave = octave
-        self.frequency = get_frequency(note, octave)
-        self.amplitude = amplitude
+        self.frequency = _FREQ_TABLE[12 * (octave + 1) + NOTE_SEMITONES[note]]
+        self.amplitude = np.float32(amplitude)
     
     def _generate_time_array(self, duration: float) -> np.ndarray:
         """Create time array for given duration"""
-        return np.linspace(0, duration, int(SAMPLE_RATE * duration), False)
+        return np.linspace(0, duration, int(SAMPLE_RATE * duration), False, dtype=np.float32)
     
     def sine_wave(self, duration: float) -> np.ndarray:
         """Generate smooth sine wave"""
-        t = self._generate_time_array(duration)
-        return self.amplitude * np.sin(2 * np.pi * self.frequency * t)
+        return self.harmonic_wave(duration, [1])
     
     def square_wave(self, duration: float) -> np.ndarray:
         """Generate retro square wave"""
@@ -28,65 +135,141 @@ class WaveGenerator:
         sine = np.sin(2 * np.pi * self.frequency * t)
         return self.amplitude * np.sign(sine)
     
+    def _wrapped_phase(self, duration: float) -> np.ndarray:
+        """Phase in cycles, wrapped to [-0.5, 0.5], computed in place"""
+        phase = self._generate_time_array(duration)
+        phase *= self.frequency
+        np.subtract(phase, np.rint(phase), out=phase)
+        return phase
+    
     def sawtooth_wave(self, duration: float) -> np.ndarray:
         """Generate buzzy sawtooth wave"""
-        t = self._generate_time_array(duration)
-        return self.amplitude * (2 * (t * self.frequency - np.floor(t * self.frequency + 0.5)))
+        wave = self._wrapped_phase(duration)
+        wave *= 2 * self.amplitude
+        return wave
     
     def triangle_wave(self, duration: float) -> np.ndarray:
         """Generate soft triangle wave"""
-        t = self._generate_time_array(duration)
-        return self.amplitude * (2 * np.abs(2 * (t * self.frequency - np.floor(t * self.frequency + 0.5))) - 1)
+        wave = self._wrapped_phase(duration)
+        np.abs(wave, out=wave)
+        wave *= 4
+        wave -= 1
+        wave *= self.amplitude
+        return wave
     
     def harmonic_wave(self, duration: float, harmonics: list = [1, 0.5, 0.25, 0.125]) -> np.ndarray:
         """Generate wave with multiple harmonics"""
-        t = self._generate_time_array(duration)
-        wave = np.zeros_like(t)
-        
-        for i, harmonic_amp in enumerate(harmonics):
-            harmonic_freq = self.frequency * (i + 1)
-            wave += harmonic_amp * np.sin(2 * np.pi * harmonic_freq * t)
-        
-        return self.amplitude * wave / len(harmonics)
+        wave = np.empty(int(SAMPLE_RATE * duration), dtype=np.float32)
+        ratios = np.arange(1, len(harmonics) + 1, dtype=np.float32)
+        _harmonic_kernel(wave, float(self.frequency), ratios,
+                         np.asarray(harmonics, dtype=np.float32), SAMPLE_RATE)
+        wave *= self.amplitude / len(harmonics)
+        return wave
+    
+    def voice_wave(self, duration: float, harmonics: list, ratios: list = None,
+                   mod_rate: float = 0, mod_depth: float = 0, decay_rate: float = 0,
+                   envelope: tuple = (0, 0, 1, 0), reverb_amount: float = 0,
+                   delay_ms: float = 100) -> np.ndarray:
+        """Generate harmonic wave with modulation, reverb and envelope in one pass"""
+        # Without ratios the partials are the harmonic series, normalized as in
+        # harmonic_wave; explicit ratios play inharmonic partials at full amplitude.
+        # mod_depth < 0 matches apply_tremolo, > 0 matches apply_vibrato;
+        # decay_rate is an exponential fade per second;
+        # envelope is (attack, decay, sustain, release) as in apply_envelope
+        if ratios is None:
+            ratios = range(1, len(harmonics) + 1)
+            scale = self.amplitude / len(harmonics)
+        else:
+            scale = self.amplitude
+        attack, decay, sustain, release = envelope
+        wave = np.empty(int(SAMPLE_RATE * duration), dtype=np.float32)
+        _voice_kernel(wave, float(self.frequency), np.asarray(ratios, dtype=np.float32),
+                      np.asarray(harmonics, dtype=np.float32), float(scale), SAMPLE_RATE,
+                      float(mod_rate), float(mod_depth), float(decay_rate),
+                      int(attack * SAMPLE_RATE), int(decay * SAMPLE_RATE),
+                      float(sustain), int(release * SAMPLE_RATE),
+                      *_reverb_taps(int(SAMPLE_RATE * delay_ms / 1000), float(reverb_amount)))
+        return wave
+
+
+@functools.lru_cache(maxsize=32)
+def _reverb_taps(delay_samples: int, reverb_amount: float) -> tuple:
+    """Non-zero taps (delays, gains) of the echo impulse response; read-only"""
+    # h[0] = 1 is the dry signal, h[k * delay] = reverb_amount * 0.6 ** (k - 1) for k = 1..3
+    echoes = 3 if reverb_amount != 0 and delay_samples > 0 else 0
+    delays = np.array([delay_samples * (i + 1) for i in range(echoes)], dtype=np.int64)
+    gains = np.array([reverb_amount * (0.6 ** i) for i in range(echoes)], dtype=np.float64)
+    delays.flags.writeable = False
+    gains.flags.writeable = False
+    return delays, gains
+
+
+@functools.lru_cache(maxsize=16)
+def _sample_ramp(size: int) -> np.ndarray:
+    """Sample indices 0..size-1 as a read-only float32 array"""
+    ramp = np.arange(size, dtype=np.float32)
+    ramp.flags.writeable = False
+    return ramp
+
+
+@functools.lru_cache(maxsize=64)
+def _adsr_envelope(total_samples: int, attack: float, decay: float,
+                   sustain: float, release: float) -> np.ndarray:
+    """Build an ADSR envelope once per length and shape; the result is read-only"""
+    attack_samples = int(attack * SAMPLE_RATE)
+    decay_samples = int(decay * SAMPLE_RATE)
+    release_samples = int(release * SAMPLE_RATE)
+    sustain_samples = total_samples - attack_samples - decay_samples - release_samples
+    
+    envelope = np.ones(total_samples, dtype=np.float32)
+    
+    # Attack
+    if attack_samples > 0:
+        envelope[:attack_samples] = np.linspace(0, 1, attack_samples, dtype=np.float32)
+    
+    # Decay
+    if decay_samples > 0:
+        start_idx = attack_samples
+        end_idx = start_idx + decay_samples
+        envelope[start_idx:end_idx] = np.linspace(1, sustain, decay_samples, dtype=np.float32)
+    
+    # Sustain
+    if sustain_samples > 0:
+        start_idx = attack_samples + decay_samples
+        end_idx = start_idx + sustain_samples
+        envelope[start_idx:end_idx] = sustain
+    
+    # Release
+    if release_samples > 0:
+        envelope[-release_samples:] = np.linspace(sustain, 0, release_samples, dtype=np.float32)
+    
+    envelope.flags.writeable = False
+    return envelope
 
 
 class AudioEffects:
     """Apply audio effects to waveforms"""
     
+    # Modulation work buffers by length, per thread since chord voices render in parallel
+    _scratch = threading.local()
+    
+    @staticmethod
+    def _scratch_buffer(size: int) -> np.ndarray:
+        """Reusable float32 work buffer of the given length for the calling thread"""
+        buffers = AudioEffects._scratch.__dict__.setdefault('buffers', {})
+        buffer = buffers.get(size)
+        if buffer is None:
+            buffer = buffers[size] = np.empty(size, dtype=np.float32)
+        return buffer
+    
     @staticmethod
     def apply_envelope(wave: np.ndarray, attack: float = 0.1, decay: float = 0.1, 
                       sustain: float = 0.7, release: float = 0.2) -> np.ndarray:
         """Apply ADSR envelope to wave"""
-        total_samples = len(wave)
-        total_duration = total_samples / SAMPLE_RATE
-        
-        attack_samples = int(attack * SAMPLE_RATE)
-        decay_samples = int(decay * SAMPLE_RATE)
-        release_samples = int(release * SAMPLE_RATE)
-        sustain_samples = total_samples - attack_samples - decay_samples - release_samples
-        
-        envelope = np.ones(total_samples)
-        
-        # Attack
-        if attack_samples > 0:
-            envelope[:attack_samples] = np.linspace(0, 1, attack_samples)
-        
-        # Decay
-        if decay_samples > 0:
-            start_idx = attack_samples
-            end_idx = start_idx + decay_samples
-            envelope[start_idx:end_idx] = np.linspace(1, sustain, decay_samples)
-        
-        # Sustain
-        if sustain_samples > 0:
-            start_idx = attack_samples + decay_samples
-            end_idx = start_idx + sustain_samples
-            envelope[start_idx:end_idx] = sustain
-        
-        # Release
-        if release_samples > 0:
-            envelope[-release_samples:] = np.linspace(sustain, 0, release_samples)
-        
+        envelope = _adsr_envelope(len(wave), attack, decay, sustain, release)
+        if wave.flags.writeable:
+            wave *= envelope
+            return wave
         return wave * envelope
     
     @staticmethod
@@ -94,36 +277,44 @@ class AudioEffects:
                     delay_ms: float = 100) -> np.ndarray:
         """Add reverb effect"""
         delay_samples = int(SAMPLE_RATE * delay_ms / 1000)
-        reverb_wave = np.zeros_like(wave)
-        
-        # Add multiple delayed copies with decreasing amplitude
-        for i in range(3):
-            delay = delay_samples * (i + 1)
-            amplitude = reverb_amount * (0.6 ** i)
-            
-            if delay < len(wave):
-                reverb_wave[delay:] += amplitude * wave[:-delay]
-        
-        return wave + reverb_wave
+        # Dry signal plus delayed copies with decreasing amplitude: a sparse FIR
+        # convolved directly over its non-zero taps, in place
+        wave = np.require(wave, np.float32, ['C', 'W'])
+        _reverb_envelope_pass(wave, *_reverb_taps(delay_samples, reverb_amount), 0, 0, 1.0, 0)
+        return wave
     
     @staticmethod
     def apply_vibrato(wave: np.ndarray, rate: float = 5, depth: float = 0.02) -> np.ndarray:
         """Add vibrato (pitch modulation)"""
-        t = np.linspace(0, len(wave) / SAMPLE_RATE, len(wave), False)
-        vibrato = 1 + depth * np.sin(2 * np.pi * rate * t)
-        return wave * vibrato
+        wave = np.require(wave, np.float32, ['C', 'W'])
+        vibrato = AudioEffects._scratch_buffer(len(wave))
+        np.multiply(_sample_ramp(len(wave)), 2 * np.pi * rate / SAMPLE_RATE, out=vibrato)
+        np.sin(vibrato, out=vibrato)
+        vibrato *= depth
+        vibrato += 1
+        np.multiply(wave, vibrato, out=wave)
+        return wave
     
     @staticmethod
     def apply_tremolo(wave: np.ndarray, rate: float = 6, depth: float = 0.3) -> np.ndarray:
         """Add tremolo (amplitude modulation)"""
-        t = np.linspace(0, len(wave) / SAMPLE_RATE, len(wave), False)
-        tremolo = 1 - depth * np.sin(2 * np.pi * rate * t)
-        return wave * tremolo
+        wave = np.require(wave, np.float32, ['C', 'W'])
+        tremolo = AudioEffects._scratch_buffer(len(wave))
+        np.multiply(_sample_ramp(len(wave)), 2 * np.pi * rate / SAMPLE_RATE, out=tremolo)
+        np.sin(tremolo, out=tremolo)
+        tremolo *= -depth
+        tremolo += 1
+        np.multiply(wave, tremolo, out=wave)
+        return wave
     
     @staticmethod
     def apply_distortion(wave: np.ndarray, drive: float = 2.0) -> np.ndarray:
         """Add distortion effect"""
-        return np.tanh(drive * wave) / drive
+        wave = np.require(wave, np.float32, ['C', 'W'])
+        np.multiply(wave, drive, out=wave)
+        np.tanh(wave, out=wave)
+        np.multiply(wave, 1.0 / drive, out=wave)
+        return wave
 
 
 class SoundPresets:
@@ -133,19 +324,16 @@ class SoundPresets:
     def piano(note: str, octave: int, duration: float = 1.0) -> np.ndarray:
         """Electric piano sound"""
         gen = WaveGenerator(note, octave, amplitude=0.4)
-        wave = gen.harmonic_wave(duration, [1, 0.7, 0.3, 0.1])
-        wave = AudioEffects.apply_tremolo(wave, rate=4, depth=0.15)
-        wave = AudioEffects.apply_envelope(wave, attack=0.01, decay=0.1, sustain=0.7, release=0.3)
-        return wave
+        # Harmonics, tremolo and envelope in a single pass
+        return gen.voice_wave(duration, [1, 0.7, 0.3, 0.1], mod_rate=4, mod_depth=-0.15,
+                              envelope=(0.01, 0.1, 0.7, 0.3))
     
     @staticmethod
     def organ(note: str, octave: int, duration: float = 2.0) -> np.ndarray:
         """Church organ sound"""
         gen = WaveGenerator(note, octave, amplitude=0.3)
-        wave = gen.harmonic_wave(duration, [1, 0.8, 0.6, 0.4, 0.3, 0.2])
-        wave = AudioEffects.apply_reverb(wave, reverb_amount=0.4)
-        wave = AudioEffects.apply_envelope(wave, attack=0.2, decay=0.1, sustain=0.8, release=0.5)
-        return wave
+        return gen.voice_wave(duration, [1, 0.8, 0.6, 0.4, 0.3, 0.2], reverb_amount=0.4,
+                              envelope=(0.2, 0.1, 0.8, 0.5))
     
     @staticmethod
     def guitar(note: str, octave: int, duration: float = 1.5) -> np.ndarray:
@@ -153,7 +341,7 @@ class SoundPresets:
         gen = WaveGenerator(note, octave, amplitude=0.4)
         wave = gen.harmonic_wave(duration, [1, 0.6, 0.3, 0.1])
         # Exponential decay for plucked string
-        t = np.linspace(0, duration, len(wave), False)
+        t = np.linspace(0, duration, len(wave), False, dtype=np.float32)
         decay = np.exp(-2 * t / duration)
         wave = wave * decay
         wave = AudioEffects.apply_reverb(wave, reverb_amount=0.2)
@@ -173,17 +361,9 @@ class SoundPresets:
     def bell(note: str, octave: int, duration: float = 3.0) -> np.ndarray:
         """Bell sound"""
         gen = WaveGenerator(note, octave, amplitude=0.4)
-        # Inharmonic frequencies for bell-like sound
-        t = gen._generate_time_array(duration)
-        wave = (np.sin(2 * np.pi * gen.frequency * t) +
-                0.6 * np.sin(2 * np.pi * gen.frequency * 2.1 * t) +
-                0.4 * np.sin(2 * np.pi * gen.frequency * 3.2 * t))
-        
-        # Slow exponential decay
-        decay = np.exp(-0.8 * t / duration)
-        wave = gen.amplitude * wave * decay
-        wave = AudioEffects.apply_reverb(wave, reverb_amount=0.5)
-        return wave
+        # Inharmonic frequencies for bell-like sound, with a slow exponential decay
+        return gen.voice_wave(duration, [1, 0.6, 0.4], ratios=[1, 2.1, 3.2],
+                              decay_rate=0.8 / duration, reverb_amount=0.5)
     
     @staticmethod
     def retro(note: str, octave: int, duration: float = 0.5) -> np.ndarray:
@@ -197,11 +377,8 @@ class SoundPresets:
     def pad(note: str, octave: int, duration: float = 3.0) -> np.ndarray:
         """Ambient pad sound"""
         gen = WaveGenerator(note, octave, amplitude=0.2)
-        wave = gen.harmonic_wave(duration, [1, 0.6, 0.8, 0.4, 0.5])
-        wave = AudioEffects.apply_vibrato(wave, rate=3, depth=0.015)
-        wave = AudioEffects.apply_reverb(wave, reverb_amount=0.6)
-        wave = AudioEffects.apply_envelope(wave, attack=0.8, decay=0.2, sustain=0.7, release=1.0)
-        return wave
+        return gen.voice_wave(duration, [1, 0.6, 0.8, 0.4, 0.5], mod_rate=3, mod_depth=0.015,
+                              reverb_amount=0.6, envelope=(0.8, 0.2, 0.7, 1.0))
     
     @staticmethod
     def bass(note: str, octave: int, duration: float = 0.8) -> np.ndarray:
@@ -221,60 +398,171 @@ class SoundPresets:
         return wave
 
 
+# Available sound presets for easy access
+AVAILABLE_SOUNDS = {
+    "piano": ("Electric Piano", SoundPresets.piano),
+    "organ": ("Church Organ", SoundPresets.organ),
+    "guitar": ("Acoustic Guitar", SoundPresets.guitar),
+    "synth": ("Synthesizer", SoundPresets.synth_lead),
+    "bell": ("Bell", SoundPresets.bell),
+    "retro": ("8-bit Retro", SoundPresets.retro),
+    "pad": ("Ambient Pad", SoundPresets.pad),
+    "bass": ("Bass", SoundPresets.bass),
+    "sine": ("Pure Sine", SoundPresets.sine),
+}
+
+# Index-based tables parallel to AVAILABLE_SOUNDS, so the keypress path
+# selects a preset by integer id instead of by name
+SOUND_IDS = {sound_key: i for i, sound_key in enumerate(AVAILABLE_SOUNDS)}
+SOUND_NAMES = tuple(sound_name for sound_name, _ in AVAILABLE_SOUNDS.values())
+_PRESETS = tuple(sound_func for _, sound_func in AVAILABLE_SOUNDS.values())
+
+
+# Renders chord voices concurrently
+_render_pool = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+
+
+def _to_int16(wave: np.ndarray) -> np.ndarray:
+    """Quantize a float wave in [-1, 1] to int16 samples"""
+    scaled = np.multiply(wave, 32767, dtype=np.float32)
+    np.clip(scaled, -32768, 32767, out=scaled)
+    return scaled.astype(np.int16)
+
+
+@functools.lru_cache(maxsize=256)
+def _render_preset(sound_id: int, note: str, octave: int, duration: float) -> np.ndarray:
+    """Render a preset note once and cache the read-only int16 result"""
+    # int16 is what the output stream plays, at half the memory of float32
+    wave = _to_int16(_PRESETS[sound_id](note, octave, duration))
+    # Shared between playbacks, so it must never be modified in place
+    wave.flags.writeable = False
+    return wave
+
+
+class VoiceMixer:
+    """Mix overlapping int16 notes into an output stream callback"""
+    
+    def __init__(self):
+        # Appended by players, drained by the audio callback (deque ops are atomic)
+        self._pending = collections.deque()
+        # [wave, cursor] pairs, only touched by the audio callback
+        self._voices = []
+        # Wider accumulator so summed voices clip instead of wrapping around
+        self._mix = np.zeros(0, dtype=np.int32)
+    
+    @property
+    def busy(self) -> bool:
+        """Whether any note is still waiting or playing"""
+        return bool(self._pending or self._voices)
+    
+    def add(self, wave: np.ndarray):
+        """Start playing a wave on top of the current ones"""
+        self._pending.append(wave)
+    
+    def callback(self, outdata, frames, time, status):
+        """Sum the active voices into the next output block"""
+        if len(self._mix) < frames:
+            self._mix = np.zeros(frames, dtype=np.int32)
+        mix = self._mix[:frames]
+        mix.fill(0)
+        while self._pending:
+            self._voices.append([self._pending[0], 0])
+            self._pending.popleft()
+        
+        for voice in self._voices:
+            wave, cursor = voice
+            n = min(frames, len(wave) - cursor)
+            mix[:n] += wave[cursor:cursor + n]
+            voice[1] = cursor + n
+        
+        self._voices = [voice for voice in self._voices if voice[1] < len(voice[0])]
+        np.clip(mix, -32768, 32767, out=mix)
+        outdata[:, 0] = mix
+
+
 class SoundPlayer:
     """Handle playing sounds and chords"""
     
-    @staticmethod
-    def play_note(note: str, octave: int, sound_type: str = "piano", duration: float = 1.0):
+    # Persistent output stream; sd.play is used until one is opened
+    _stream = None
+    _mixer = VoiceMixer()
+    
+    @classmethod
+    def open_stream(cls):
+        """Open one output stream for the life of the program"""
+        if cls._stream is None:
+            cls._stream = sd.OutputStream(samplerate=SAMPLE_RATE, channels=1, dtype='int16',
+                                          blocksize=2048, latency='low',
+                                          callback=cls._mixer.callback)
+            cls._stream.start()
+    
+    @classmethod
+    def close_stream(cls):
+        """Stop and close the persistent output stream"""
+        if cls._stream is not None:
+            cls._stream.stop()
+            cls._stream.close()
+            cls._stream = None
+    
+    @classmethod
+    def _output(cls, wave: np.ndarray):
+        """Mix an int16 wave into the open stream, or play it directly"""
+        if cls._stream is None:
+            sd.play(wave, SAMPLE_RATE)
+        else:
+            cls._mixer.add(wave)
+    
+    @classmethod
+    def play_note(cls, note: str, octave: int, sound_id: int = 0, duration: float = 1.0):
         """Play a single note"""
         try:
-            # Get the appropriate sound function
-            sound_func = getattr(SoundPresets, sound_type, SoundPresets.piano)
-            wave = sound_func(note, octave, duration)
-            sd.play(wave, SAMPLE_RATE)
+            # Repeated presses of the same key reuse the rendered wave
+            wave = _render_preset(sound_id, note, octave, duration)
+            cls._output(wave)
         except Exception as e:
             print(f"Error playing {note}{octave}: {e}")
     
-    @staticmethod
-    def play_chord(notes: list, octave: int, sound_type: str = "piano", duration: float = 2.0):
+    @classmethod
+    def play_chord(cls, notes: list, octave: int, sound_id: int = 0, duration: float = 2.0):
         """Play multiple notes simultaneously"""
         try:
-            sound_func = getattr(SoundPresets, sound_type, SoundPresets.piano)
-            combined_wave = None
+            futures = [_render_pool.submit(_render_preset, sound_id, note, octave, duration)
+                       for note in notes]
+            waves = [future.result() for future in futures]
             
-            for note in notes:
-                wave = sound_func(note, octave, duration)
-                wave = wave * 0.7  # Reduce volume for mixing
-                
-                if combined_wave is None:
-                    combined_wave = wave
-                else:
-                    # Ensure same length for addition
-                    min_length = min(len(combined_wave), len(wave))
-                    combined_wave = combined_wave[:min_length] + wave[:min_length]
+            # Sum all voices in one reduction over the same length
+            min_length = min(len(wave) for wave in waves)
+            combined_wave = np.empty(min_length, dtype=np.float32)
+            np.add.reduce(np.stack([wave[:min_length] for wave in waves]), axis=0,
+                          dtype=np.float32, out=combined_wave)
+            combined_wave *= 0.7 / 32767  # Reduce volume for mixing, back to [-1, 1]
             
-            sd.play(combined_wave, SAMPLE_RATE)
+            cls._output(_to_int16(combined_wave))
         except Exception as e:
             print(f"Error playing chord: {e}")
     
-    @staticmethod
-    def wait():
+    @classmethod
+    def wait(cls):
         """Wait for current playback to finish"""
-        sd.wait()
+        if cls._stream is None:
+            sd.wait()
+        else:
+            while cls._mixer.busy:
+                sd.sleep(10)
 
 
-# Available sound presets for easy access
-AVAILABLE_SOUNDS = {
-    "piano": ("Electric Piano", SoundPresets.piano),
-    "organ": ("Church Organ", SoundPresets.organ),
-    "guitar": ("Acoustic Guitar", SoundPresets.guitar),
-    "synth": ("Synthesizer", SoundPresets.synth_lead),
-    "bell": ("Bell", SoundPresets.bell),
-    "retro": ("8-bit Retro", SoundPresets.retro),
-    "pad": ("Ambient Pad", SoundPresets.pad),
-    "bass": ("Bass", SoundPresets.bass),
-    "sine": ("Pure Sine", SoundPresets.sine),
-}
+def _warm_up_kernels():
+    """Compile the sample loops at import instead of on the first keypress"""
+    out = np.empty(1, dtype=np.float32)
+    partials = np.ones(1, dtype=np.float32)
+    _harmonic_kernel(out, 440.0, partials, partials, SAMPLE_RATE)
+    taps = _reverb_taps(1, 0.5)
+    _voice_kernel(out, 440.0, partials, partials, 1.0, SAMPLE_RATE, 0.0, 0.0, 0.0,
+                  0, 0, 1.0, 0, *taps)
+    _reverb_envelope_pass(out, *taps, 0, 0, 1.0, 0)
+
+
+_warm_up_kernels()
 
 def demo_sounds():
     """Demo all available sounds"""